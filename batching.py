@@ -0,0 +1,75 @@
+"""Dynamic request batching for feature vector serving."""
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple, Union
+
+
+class DynamicBatcher:
+    """Coalesce concurrent requests into batches handled by a single call."""
+    
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], Union[List[Any], Awaitable[List[Any]]]],
+        max_batch_size: int = 64,
+        max_delay: float = 0.01
+    ):
+        """
+        Initialize batcher.
+        
+        Args:
+            process_batch: Function mapping a list of items to a list of results
+                in the same order; coroutine functions are awaited on the event
+                loop, blocking functions run in a worker thread
+            max_batch_size: Maximum number of items per batch
+            max_delay: Maximum time in seconds to wait for a batch to fill
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result from the next batch."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        
+        return await future
+    
+    def _flush(self):
+        """Hand the pending items off as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        batch, self._pending = self._pending, []
+        if batch:
+            # Keep a reference so the task isn't garbage collected mid-run
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        """Process a batch and resolve each caller's future."""
+        items = [item for item, _ in batch]
+        try:
+            if inspect.iscoroutinefunction(self.process_batch):
+                results = await self.process_batch(items)
+            else:
+                results = await asyncio.get_running_loop().run_in_executor(None, self.process_batch, items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -1,49 +1,89 @@
 """Caching mechanism for feature vectors."""
 from cachetools import TTLCache
-from typing import Dict, Any, Optional
-import hashlib
-import json
-from datetime import datetime
+from typing import Optional, Tuple
+import orjson
+import os
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # redis is optional; the cache is kept in-process
+    redis = None
 
 
 class FeatureCache:
-    """Simple TTL-based cache for feature vectors."""
+    """
+    TTL-based cache for serialized feature vector responses.
+    
+    Values are response bodies serialized up to the retrieved_at timestamp, so
+    a hit only needs the timestamp appended before it is returned. The cache
+    lives in-process by default; given a Redis URL it is shared by all workers.
+    """
     
-    def __init__(self, maxsize: int = 1000, ttl: int = 3600):
+    def __init__(self, maxsize: int = 1000, ttl: int = 3600, redis_url: Optional[str] = None):
         """
         Initialize cache.
         
         Args:
-            maxsize: Maximum number of cached items
+            maxsize: Maximum number of cached items (in-process cache only)
             ttl: Time to live in seconds (default 1 hour)
+            redis_url: Optional Redis URL to share the cache across workers
         """
+        self.ttl = ttl
         self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.redis = None
+        if redis_url:
+            if redis is None:
+                raise ImportError("REDIS_URL requires the redis package to be installed")
+            self.redis = redis.Redis.from_url(redis_url)
+    
+    def _make_key(self, entity_id: str, feature_names: Optional[list], version: Optional[str]) -> Tuple:
+        """
+        Generate cache key from request parameters.
+        
+        The key is a plain tuple; TTLCache accepts any hashable key, so no
+        string building or digest is needed. feature_names must already be
+        canonical (sorted and deduplicated, as FeatureVectorRequest does).
+        """
+        names = tuple(feature_names) if feature_names else None
+        return (entity_id, names, version or None)
     
-    def _make_key(self, entity_id: str, feature_names: Optional[list], version: Optional[str]) -> str:
-        """Generate cache key from request parameters."""
-        key_parts = [entity_id]
-        if feature_names:
-            key_parts.append(','.join(sorted(feature_names)))
-        if version:
-            key_parts.append(version)
-        key_str = '|'.join(key_parts)
-        return hashlib.md5(key_str.encode()).hexdigest()
+    def _redis_key(self, key: Tuple) -> str:
+        """Convert a cache key to a Redis key."""
+        return "feature_vector:" + orjson.dumps(key).decode()
     
-    def get(self, entity_id: str, feature_names: Optional[list] = None, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
-        """Get cached feature vector."""
+    async def get(self, entity_id: str, feature_names: Optional[list] = None, version: Optional[str] = None) -> Optional[bytes]:
+        """Get cached feature vector response bytes."""
         key = self._make_key(entity_id, feature_names, version)
-        return self.cache.get(key)
+        if self.redis is None:
+            return self.cache.get(key)
+        
+        try:
+            return await self.redis.get(self._redis_key(key))
+        except redis.RedisError:
+            # Treat an unavailable cache as a miss
+            return None
     
-    def set(self, entity_id: str, features: Dict[str, Any], feature_names: Optional[list] = None, version: Optional[str] = None):
-        """Cache feature vector."""
+    async def set(self, entity_id: str, response: bytes, feature_names: Optional[list] = None, version: Optional[str] = None):
+        """Cache feature vector response bytes."""
         key = self._make_key(entity_id, feature_names, version)
-        self.cache[key] = features
+        if self.redis is None:
+            self.cache[key] = response
+            return
+        
+        try:
+            await self.redis.set(self._redis_key(key), response, ex=self.ttl)
+        except redis.RedisError:
+            pass
     
-    def clear(self):
+    async def clear(self):
         """Clear all cached items."""
-        self.cache.clear()
+        if self.redis is None:
+            self.cache.clear()
+            return
+        
+        async for key in self.redis.scan_iter(match="feature_vector:*"):
+            await self.redis.delete(key)
 
 
 # Global cache instance
-feature_cache = FeatureCache(maxsize=1000, ttl=3600)
-
+feature_cache = FeatureCache(maxsize=1000, ttl=3600, redis_url=os.getenv("REDIS_URL"))
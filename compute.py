@@ -1,9 +1,422 @@
 """Feature computation logic."""
 import pandas as pd
+import numpy as np
+from sqlalchemy import and_, or_, func, exists, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from typing import Dict, Any, List
-import json
-import hashlib
+from typing import Dict, Any, List, Optional, Tuple, Callable
+import ast
+import types
+import orjson
+from functools import lru_cache
+
+try:
+    import numba
+except ImportError:  # Numba is optional; numeric features use the general path
+    numba = None
+
+try:
+    import numexpr
+except ImportError:  # numexpr is optional; expression logic uses the general path
+    numexpr = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional; records are loaded with pandas directly
+    pa = None
+
+from .models import FeatureVersion, FeatureValue, FeatureLatestVersion, FeatureValueFile
+from .value_store import value_store, decode_value
+from .online_store import online_store
+
+# Rows per bulk INSERT; bounds memory for very large versions
+INSERT_BATCH_SIZE = 10_000
+
+# Allow NumPy values and non-string dict keys inside complex feature values
+_JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+# pandas functions and constructors computation logic may use as pd.<name>;
+# submodules (pd.io, pd.api, pd.core, ...), readers and options are not reachable
+_PANDAS_ATTRIBUTES = frozenset({
+    'Series', 'DataFrame', 'Index', 'MultiIndex', 'Categorical', 'CategoricalDtype',
+    'Timestamp', 'Timedelta', 'DateOffset', 'Period', 'Interval', 'NA', 'NaT',
+    'Int64Dtype', 'Float64Dtype', 'BooleanDtype', 'StringDtype',
+    'concat', 'merge', 'merge_asof', 'cut', 'qcut', 'get_dummies', 'factorize', 'unique',
+    'to_numeric', 'to_datetime', 'to_timedelta', 'isna', 'isnull', 'notna', 'notnull',
+    'date_range', 'timedelta_range', 'period_range', 'interval_range',
+    'crosstab', 'pivot_table', 'melt', 'Grouper',
+})
+
+# Attributes computation logic may use on any other object: Series/DataFrame
+# (and their str/dt/cat accessors, groupby/window objects and NumPy arrays)
+# compute methods, plus common str/list/dict methods. Anything else, notably
+# file I/O (to_csv, to_json, ...) and string-evaluating helpers, is rejected.
+_OBJECT_ATTRIBUTES = frozenset({
+    # Arithmetic and comparison
+    'abs', 'add', 'sub', 'mul', 'div', 'truediv', 'floordiv', 'mod', 'pow', 'dot',
+    'radd', 'rsub', 'rmul', 'rdiv', 'rtruediv', 'rfloordiv', 'rmod', 'rpow',
+    'lt', 'le', 'gt', 'ge', 'eq', 'ne', 'between', 'clip', 'round', 'isin',
+    # Reductions and statistics
+    'sum', 'mean', 'median', 'min', 'max', 'std', 'var', 'sem', 'skew', 'kurt', 'prod',
+    'count', 'nunique', 'quantile', 'mode', 'any', 'all', 'idxmin', 'idxmax',
+    'argmin', 'argmax', 'value_counts', 'describe', 'corr', 'cov', 'corrwith',
+    'size', 'first', 'last', 'nth', 'ngroup', 'cumcount',
+    # Cumulative and window operations
+    'cumsum', 'cumprod', 'cummax', 'cummin', 'rank', 'diff', 'pct_change', 'shift',
+    'groupby', 'rolling', 'expanding', 'ewm', 'resample',
+    'apply', 'agg', 'aggregate', 'transform', 'pipe', 'map',
+    # Missing values and selection
+    'isna', 'isnull', 'notna', 'notnull', 'fillna', 'ffill', 'bfill', 'dropna',
+    'interpolate', 'replace', 'where', 'mask', 'duplicated', 'drop_duplicates', 'unique',
+    'head', 'tail', 'nlargest', 'nsmallest', 'sort_values', 'sort_index', 'sample',
+    'loc', 'iloc', 'at', 'iat', 'get',
+    # Reshaping and conversion
+    'astype', 'copy', 'rename', 'set_index', 'reset_index', 'reindex', 'drop', 'assign',
+    'squeeze', 'explode', 'stack', 'unstack', 'pivot', 'pivot_table', 'melt', 'merge',
+    'join', 'combine_first', 'to_numpy', 'to_list', 'tolist', 'to_dict', 'to_frame',
+    'index', 'columns', 'values', 'dtype', 'dtypes', 'shape', 'ndim', 'empty', 'name', 'T',
+    'items', 'keys', 'append',
+    # str accessor and str methods
+    'str', 'lower', 'upper', 'title', 'capitalize', 'strip', 'lstrip', 'rstrip', 'len',
+    'contains', 'startswith', 'endswith', 'split', 'slice', 'extract', 'findall',
+    'pad', 'zfill', 'cat', 'isdigit', 'isnumeric', 'isalpha', 'isalnum',
+    # dt and cat accessors
+    'dt', 'year', 'month', 'day', 'hour', 'minute', 'second', 'dayofweek', 'day_of_week',
+    'dayofyear', 'day_of_year', 'weekday', 'quarter', 'date', 'time', 'floor', 'ceil',
+    'normalize', 'total_seconds', 'days', 'seconds', 'tz_localize', 'tz_convert',
+    'strftime', 'is_month_start', 'is_month_end', 'codes', 'categories',
+})
+
+# Methods that look up a function given by name (e.g. df.apply('sum')); the
+# names they receive are checked against _OBJECT_ATTRIBUTES as well
+_FUNCTION_ARGUMENT_METHODS = frozenset({'apply', 'agg', 'aggregate', 'transform', 'pipe'})
+
+
+def _check_function_argument(node: ast.AST, function_names: set):
+    """
+    Check a function passed to apply/agg/transform/pipe is statically known.
+    
+    Allows lambdas, names of functions defined in the logic, pd.<function>,
+    allowlisted method names other than apply/agg/transform/pipe themselves,
+    and lists/tuples/dicts of those.
+    
+    Raises:
+        ValueError: If the function could resolve to a disallowed method
+    """
+    if isinstance(node, ast.Lambda):
+        return
+    if isinstance(node, ast.Name) and node.id in function_names:
+        return
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'pd':
+        return
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        # Named apply/agg/transform/pipe would dispatch again on unchecked arguments
+        if node.value not in _OBJECT_ATTRIBUTES or node.value in _FUNCTION_ARGUMENT_METHODS:
+            raise ValueError(f"Function '{node.value}' is not allowed in computation logic")
+        return
+    if isinstance(node, (ast.List, ast.Tuple)):
+        for element in node.elts:
+            _check_function_argument(element, function_names)
+        return
+    if isinstance(node, ast.Dict) and None not in node.keys:
+        for value in node.values:
+            _check_function_argument(value, function_names)
+        return
+    raise ValueError("Functions passed to apply, agg, transform or pipe must be lambdas, defined functions or method names")
+
+
+def _check_function_call(node: ast.Call, function_names: set):
+    """Check the function arguments of an apply/agg/transform/pipe call."""
+    if any(isinstance(arg, ast.Starred) for arg in node.args) or any(kw.arg is None for kw in node.keywords):
+        raise ValueError(f"Argument unpacking is not allowed in '{node.func.attr}' calls")
+    func = node.args[0] if node.args else next((kw.value for kw in node.keywords if kw.arg == 'func'), None)
+    if func is not None:
+        _check_function_argument(func, function_names)
+    
+    # Extra arguments reach the function, and may name a method to dispatch to
+    extra_args = node.args[1:] + [kw.value for kw in node.keywords if kw.arg == 'args']
+    for arg in extra_args:
+        for child in ast.walk(arg):
+            if isinstance(child, ast.Constant) and isinstance(child.value, str):
+                _check_function_argument(child, function_names)
+    
+    if func is None and node.func.attr in ('agg', 'aggregate'):
+        # Named aggregation: name=(column, function)
+        for keyword in node.keywords:
+            if isinstance(keyword.value, ast.Tuple) and len(keyword.value.elts) == 2:
+                _check_function_argument(keyword.value.elts[1], function_names)
+
+
+def validate_logic(computation_logic: str) -> ast.Module:
+    """
+    Check that computation logic is valid and safe to run.
+    
+    Rejects imports, global/nonlocal declarations and dunder names. Attributes
+    must be on an allowlist: pandas functions/constructors on ``pd`` and
+    compute methods on everything else, so file I/O, pandas submodules and
+    string-evaluating helpers are unreachable. Functions passed to
+    apply/agg/transform/pipe must be statically known, since pandas looks up
+    functions given by name.
+    
+    Args:
+        computation_logic: Python code that computes the feature
+        
+    Returns:
+        Parsed logic
+        
+    Raises:
+        SyntaxError: If the logic is not valid Python
+        ValueError: If the logic uses a disallowed construct or never assigns 'result'
+    """
+    tree = ast.parse(computation_logic, mode='exec')
+    # Surface errors like top-level 'return' before the logic is wrapped in a function
+    compile(tree, "<feature>", "exec")
+    
+    # Names bound only by a def can safely be passed as functions
+    function_names = {node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)}
+    rebound_names = {node.arg for node in ast.walk(tree) if isinstance(node, ast.arg)}
+    rebound_names.update(
+        node.id for node in ast.walk(tree) if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load)
+    )
+    function_names -= rebound_names
+    
+    assigns_result = False
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            raise ValueError("Imports are not allowed in computation logic")
+        if isinstance(node, (ast.Global, ast.Nonlocal)):
+            raise ValueError("global and nonlocal are not allowed in computation logic")
+        if isinstance(node, ast.Attribute):
+            on_pandas = isinstance(node.value, ast.Name) and node.value.id == 'pd'
+            if node.attr not in (_PANDAS_ATTRIBUTES if on_pandas else _OBJECT_ATTRIBUTES):
+                raise ValueError(f"Attribute '{node.attr}' is not allowed in computation logic")
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr in _FUNCTION_ARGUMENT_METHODS):
+            _check_function_call(node, function_names)
+        if isinstance(node, ast.Name):
+            if node.id.startswith('__'):
+                raise ValueError(f"Name '{node.id}' is not allowed in computation logic")
+            if node.id == 'result' and isinstance(node.ctx, ast.Store):
+                assigns_result = True
+    
+    if not assigns_result:
+        raise ValueError("Computation logic must assign result to 'result' variable")
+    
+    return tree
+
+
+@lru_cache(maxsize=512)
+def _compile_logic(computation_logic: str) -> Callable:
+    """
+    Validate computation logic and compile it into a function.
+    
+    The logic becomes the body of ``_compute(pd, df, raw_data)`` returning
+    ``result``, so it runs with fast locals and no per-call namespace dict.
+    Compiled once per distinct source.
+    """
+    tree = validate_logic(computation_logic)
+    
+    wrapper = ast.parse("def _compute(pd, df, raw_data):\n    return result\n")
+    wrapper.body[0].body[:0] = tree.body
+    code = compile(ast.fix_missing_locations(wrapper), "<feature>", "exec")
+    
+    func_code = next(const for const in code.co_consts if isinstance(const, types.CodeType))
+    return types.FunctionType(func_code, {"__builtins__": {}}, "_compute")
+
+
+# Expression nodes allowed in Numba-compiled logic; limited to operators whose NumPy
+# semantics (division by zero, integer dtypes) match pandas exactly
+_NUMBA_NODES = (
+    ast.BinOp, ast.UnaryOp,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.UAdd, ast.USub,
+)
+
+# Expression nodes allowed in logic evaluated with numexpr; % and // are excluded
+# because numexpr returns 0 for integer division by zero where pandas returns NaN/inf
+_EVAL_NODES = _NUMBA_NODES + (
+    ast.Pow, ast.BitAnd, ast.BitOr, ast.Invert,
+    ast.Compare, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq,
+)
+
+# Column dtypes the numexpr path accepts; numexpr widens narrower dtypes where
+# pandas keeps them (e.g. int8 overflow wraps in pandas)
+_EVAL_DTYPES = (np.dtype('int64'), np.dtype('float64'), np.dtype('bool'))
+
+# Source symbols of allowed operators, for emitting fully parenthesized expressions
+_OPERATOR_SYMBOLS = {
+    ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/', ast.Pow: '**',
+    ast.BitAnd: '&', ast.BitOr: '|', ast.UAdd: '+', ast.USub: '-', ast.Invert: '~',
+    ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>=', ast.Eq: '==', ast.NotEq: '!=',
+}
+
+# Column dtypes the Numba path accepts
+_JIT_DTYPES = (np.dtype('int64'), np.dtype('float64'))
+
+# Jitted functions (and their input columns) keyed by logic source; None if ineligible
+_numba_cache: Dict[str, Optional[Tuple[Callable, List[str]]]] = {}
+
+
+class _ColumnRewriter(ast.NodeTransformer):
+    """Rewrite df['col'] subscripts to positional names, rejecting nodes outside an allowlist."""
+    
+    def __init__(self, allowed_nodes: Tuple[type, ...]):
+        self.allowed_nodes = allowed_nodes
+        self.columns: List[str] = []
+    
+    def visit_Subscript(self, node):
+        if not (isinstance(node.value, ast.Name) and node.value.id in ('df', 'raw_data')
+                and isinstance(node.slice, ast.Constant) and isinstance(node.slice.value, str)):
+            raise ValueError("Unsupported subscript")
+        if node.slice.value not in self.columns:
+            self.columns.append(node.slice.value)
+        return ast.Name(id=f"_c{self.columns.index(node.slice.value)}", ctx=ast.Load())
+    
+    def visit_BinOp(self, node):
+        # ** is only evaluated over float64 columns (see _compute_eval); an operand
+        # without a column must be a float so integer powers never reach numexpr,
+        # which truncates negative integer exponents where pandas raises
+        if isinstance(node.op, ast.Pow):
+            for operand in (node.left, node.right):
+                if not any(isinstance(child, ast.Subscript) for child in ast.walk(operand)) and not (
+                        isinstance(operand, ast.Constant) and isinstance(operand.value, float)):
+                    raise ValueError("Unsupported power operand")
+        return self.generic_visit(node)
+    
+    def visit_Compare(self, node):
+        # pd.eval doesn't evaluate chained comparisons the way Python does
+        if len(node.ops) > 1:
+            raise ValueError("Chained comparisons are not supported")
+        return self.generic_visit(node)
+    
+    def visit_Constant(self, node):
+        if not isinstance(node.value, (int, float)) or isinstance(node.value, bool):
+            raise ValueError("Unsupported constant")
+        return node
+    
+    def generic_visit(self, node):
+        if not isinstance(node, self.allowed_nodes):
+            raise ValueError(f"Unsupported expression: {type(node).__name__}")
+        return super().generic_visit(node)
+
+
+def _unparse_parenthesized(node: ast.AST) -> str:
+    """
+    Unparse a rewritten expression with every operation parenthesized.
+    
+    pd.eval gives & and | the precedence of 'and'/'or' (below comparisons),
+    so the expression must not rely on Python's operator precedence.
+    """
+    if isinstance(node, ast.BinOp):
+        return f"({_unparse_parenthesized(node.left)} {_OPERATOR_SYMBOLS[type(node.op)]} {_unparse_parenthesized(node.right)})"
+    if isinstance(node, ast.UnaryOp):
+        return f"({_OPERATOR_SYMBOLS[type(node.op)]}{_unparse_parenthesized(node.operand)})"
+    if isinstance(node, ast.Compare):
+        return (f"({_unparse_parenthesized(node.left)} {_OPERATOR_SYMBOLS[type(node.ops[0])]} "
+                f"{_unparse_parenthesized(node.comparators[0])})")
+    return ast.unparse(node)
+
+
+@lru_cache(maxsize=512)
+def _rewrite_result_expression(
+    computation_logic: str,
+    allowed_nodes: Tuple[type, ...]
+) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """
+    Extract the expression from single-statement ``result = <expr>`` logic.
+    
+    Args:
+        computation_logic: Python code that computes the feature
+        allowed_nodes: AST node types the expression may contain
+        
+    Returns:
+        Tuple of (parenthesized expression over _c0, _c1, ..., input column names), or None
+        if the logic is not a single eligible expression over at least one column
+    """
+    try:
+        tree = ast.parse(computation_logic, mode='exec')
+        if not (len(tree.body) == 1 and isinstance(tree.body[0], ast.Assign)
+                and len(tree.body[0].targets) == 1
+                and isinstance(tree.body[0].targets[0], ast.Name)
+                and tree.body[0].targets[0].id == 'result'):
+            return None
+        rewriter = _ColumnRewriter(allowed_nodes)
+        expr = rewriter.visit(tree.body[0].value)
+    except (SyntaxError, ValueError):
+        return None
+    
+    if not rewriter.columns:
+        return None
+    return _unparse_parenthesized(expr), tuple(rewriter.columns)
+
+
+def _jit_numeric_logic(computation_logic: str) -> Optional[Tuple[Callable, List[str]]]:
+    """
+    Compile numeric computation logic to native code with Numba.
+    
+    Only logic of the form ``result = <arithmetic on df['col'] and numbers>``
+    is eligible; anything else returns None and runs through the general path.
+    
+    Args:
+        computation_logic: Python code that computes the feature
+        
+    Returns:
+        Tuple of (jitted function, input column names), or None if ineligible
+    """
+    if computation_logic in _numba_cache:
+        return _numba_cache[computation_logic]
+    
+    jitted = None
+    parsed = _rewrite_result_expression(computation_logic, _NUMBA_NODES)
+    if parsed is not None:
+        expr, columns = parsed
+        args = ', '.join(f"_c{i}" for i in range(len(columns)))
+        namespace: Dict[str, Any] = {}
+        exec(f"def _jitted({args}):\n    return {expr}\n", namespace)
+        jitted = (numba.njit(error_model='numpy')(namespace['_jitted']), list(columns))
+    
+    _numba_cache[computation_logic] = jitted
+    return jitted
+
+
+def _compute_numeric_jit(raw_data: pd.DataFrame, computation_logic: str) -> Optional[pd.Series]:
+    """Run numeric logic through Numba; None if ineligible or the inputs can't be jitted."""
+    jitted = _jit_numeric_logic(computation_logic)
+    if jitted is None:
+        return None
+    
+    func, columns = jitted
+    # Only int64/float64 columns; bools, nullable and narrower dtypes follow different
+    # type promotion rules under Numba than in NumPy
+    if not all(col in raw_data.columns and raw_data[col].dtype in _JIT_DTYPES for col in columns):
+        return None
+    
+    arrays = [np.ascontiguousarray(raw_data[col].to_numpy()) for col in columns]
+    try:
+        values = func(*arrays)
+    except Exception:
+        return None
+    return pd.Series(values, index=raw_data.index)
+
+
+def _compute_eval(raw_data: pd.DataFrame, computation_logic: str) -> Optional[pd.Series]:
+    """Evaluate single-expression logic with numexpr; None if ineligible or evaluation fails."""
+    parsed = _rewrite_result_expression(computation_logic, _EVAL_NODES)
+    if parsed is None:
+        return None
+    
+    expr, columns = parsed
+    # Powers only over float columns, so every ** operand is a float
+    dtypes = (np.dtype('float64'),) if '**' in expr else _EVAL_DTYPES
+    if not all(col in raw_data.columns and raw_data[col].dtype in dtypes for col in columns):
+        return None
+    
+    local_dict = {f"_c{i}": raw_data[col] for i, col in enumerate(columns)}
+    try:
+        result = pd.eval(expr, engine='numexpr', local_dict=local_dict)
+    except Exception:
+        return None
+    return result if isinstance(result, pd.Series) else None
 
 
 def compute_feature(
@@ -11,7 +424,8 @@ def compute_feature(
     feature_id: int,
     version: str,
     raw_data: pd.DataFrame,
-    computation_logic: str
+    computation_logic: str,
+    feature_type: Optional[str] = None
 ) -> pd.Series:
     """
     Compute feature values from raw data using computation logic.
@@ -22,26 +436,26 @@ def compute_feature(
         version: Version string
         raw_data: DataFrame containing raw data
         computation_logic: Python code or SQL query to compute feature
+        feature_type: Type of feature; 'numeric' logic is JIT-compiled with Numba when possible
         
     Returns:
         Series with computed feature values indexed by entity_id
     """
-    # Create a safe execution environment
-    safe_dict = {
-        'pd': pd,
-        'df': raw_data,
-        'raw_data': raw_data,
-    }
+    # Fast path: simple arithmetic over numeric columns runs as native code
+    if feature_type == 'numeric' and numba is not None:
+        result = _compute_numeric_jit(raw_data, computation_logic)
+        if result is not None:
+            return result
+    
+    # Single expressions over numeric columns are evaluated by numexpr directly
+    if numexpr is not None:
+        result = _compute_eval(raw_data, computation_logic)
+        if result is not None:
+            return result
     
     try:
-        # Execute computation logic
-        exec(computation_logic, {"__builtins__": {}}, safe_dict)
-        
-        # Expect result to be in 'result' variable
-        if 'result' not in safe_dict:
-            raise ValueError("Computation logic must assign result to 'result' variable")
-        
-        result = safe_dict['result']
+        # Run validated logic as a function without builtins; it returns 'result'
+        result = _compile_logic(computation_logic)(pd, raw_data, raw_data)
         
         # Ensure result is a Series with entity_id as index
         if isinstance(result, pd.Series):
@@ -58,36 +472,333 @@ def compute_feature(
         raise ValueError(f"Error computing feature: {str(e)}")
 
 
+def _serialize_values(feature_values: pd.Series) -> np.ndarray:
+    """
+    Convert feature values to their stored string form.
+    
+    Numeric and boolean Series are converted in a single vectorized pass;
+    only object Series fall back to per-element work, and only dicts/lists
+    are JSON encoded.
+    
+    Args:
+        feature_values: Series with entity_id as index and feature values
+        
+    Returns:
+        Array of string values aligned with the Series index
+    """
+    if isinstance(feature_values.dtype, np.dtype) and pd.api.types.is_numeric_dtype(feature_values):
+        return feature_values.to_numpy().astype(str).astype(object)
+    
+    values = feature_values.astype(object)
+    is_complex = values.map(lambda v: isinstance(v, (dict, list))).to_numpy(dtype=bool)
+    values_str = values.map(str).to_numpy(dtype=object)
+    if is_complex.any():
+        values_str[is_complex] = values[is_complex].map(
+            lambda value: orjson.dumps(value, option=_JSON_OPTIONS).decode()
+        ).to_numpy(dtype=object)
+    return values_str
+
+
+def _entity_id_strings(index: pd.Index) -> np.ndarray:
+    """
+    Convert entity IDs to the same strings str() gives.
+    
+    Plain NumPy int/float/bool IDs without missing values are converted in a
+    single vectorized pass. Everything else (object, string, nullable,
+    datetime-like and MultiIndex IDs, or any with missing values) is
+    formatted per element, since astype(str) keeps missing values and
+    formats dates differently from str().
+    
+    Args:
+        index: Index of entity IDs
+        
+    Returns:
+        Array of entity ID strings
+    """
+    if (not isinstance(index, pd.MultiIndex) and isinstance(index.dtype, np.dtype)
+            and index.dtype.kind in 'biuf' and not index.hasnans):
+        return index.astype(str).to_numpy(dtype=object)
+    return index.astype(object).map(str).to_numpy(dtype=object)
+
+
+def _downcast_numeric(feature_values: pd.Series) -> pd.Series:
+    """
+    Shrink numeric values to the smallest dtype that represents them exactly.
+    
+    Integers are downcast to the smallest integer type that fits; floats are
+    downcast to float32 only when every value survives the round trip.
+    
+    Args:
+        feature_values: Series with entity_id as index and numeric values
+        
+    Returns:
+        Downcast Series, or the original if no exact downcast exists
+    """
+    kind = feature_values.dtype.kind
+    if kind in 'iu':
+        return pd.to_numeric(feature_values, downcast='integer')
+    
+    if kind == 'f':
+        # pandas downcasts floats even when precision is lost, so verify it is exact
+        downcast = pd.to_numeric(feature_values, downcast='float')
+        if downcast.dtype != feature_values.dtype and np.array_equal(
+            downcast.to_numpy(dtype=np.float64),
+            feature_values.to_numpy(dtype=np.float64),
+            equal_nan=True
+        ):
+            return downcast
+    
+    return feature_values
+
+
 def store_feature_values(
     db: Session,
     feature_version_id: int,
     feature_values: pd.Series
 ):
     """
-    Store computed feature values in the database.
+    Store computed feature values.
+    
+    Values go to the Parquet value store when one is configured, otherwise
+    to the database as one row per entity.
     
     Args:
         db: Database session
         feature_version_id: ID of the feature version
         feature_values: Series with entity_id as index and feature values
     """
-    for entity_id, value in feature_values.items():
-        # Convert value to string (can be JSON for complex types)
-        if isinstance(value, (dict, list)):
-            value_str = json.dumps(value)
+    if value_store is not None:
+        # Numeric values are stored natively in their smallest exact dtype; everything
+        # else (including bools) pre-serialized, so it is served as from database rows
+        if isinstance(feature_values.dtype, np.dtype) and feature_values.dtype.kind in 'iuf':
+            feature_values = _downcast_numeric(feature_values)
         else:
-            value_str = str(value)
+            feature_values = pd.Series(_serialize_values(feature_values), index=feature_values.index)
         
-        feature_value = FeatureValue(
-            feature_version_id=feature_version_id,
-            entity_id=str(entity_id),
-            value=value_str
+        path = value_store.write(feature_version_id, _entity_id_strings(feature_values.index), feature_values)
+        db.add(FeatureValueFile(feature_version_id=feature_version_id, path=path))
+        db.commit()
+        return
+    
+    # Convert entity IDs and values to strings up front (JSON for complex types)
+    entity_ids = _entity_id_strings(feature_values.index)
+    values_str = _serialize_values(feature_values)
+    
+    # Insert in batches as plain mappings to skip per-row ORM bookkeeping
+    for start in range(0, len(entity_ids), INSERT_BATCH_SIZE):
+        end = start + INSERT_BATCH_SIZE
+        rows = [
+            {"feature_version_id": feature_version_id, "entity_id": entity_id, "value": value_str}
+            for entity_id, value_str in zip(entity_ids[start:end], values_str[start:end])
+        ]
+        db.bulk_insert_mappings(FeatureValue, rows)
+    
+    db.commit()
+
+
+def update_latest_version(db: Session, feature_version: FeatureVersion):
+    """
+    Point the feature's latest-version entry at this version if it is newer.
+    
+    Uses a single INSERT ... ON CONFLICT DO UPDATE on PostgreSQL and SQLite so
+    concurrent writers can't regress the entry; other databases update in place.
+    
+    Args:
+        db: Database session
+        feature_version: Newly stored feature version
+    """
+    values = {
+        "feature_id": feature_version.feature_id,
+        "feature_version_id": feature_version.id,
+        "computed_at": feature_version.computed_at,
+    }
+    dialect = db.get_bind().dialect.name
+    
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(FeatureLatestVersion).values(**values)
+        # Newer computed_at wins; version ID breaks ties, matching serving order
+        is_newer = or_(
+            stmt.excluded.computed_at > FeatureLatestVersion.computed_at,
+            and_(
+                stmt.excluded.computed_at == FeatureLatestVersion.computed_at,
+                stmt.excluded.feature_version_id > FeatureLatestVersion.feature_version_id
+            )
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FeatureLatestVersion.feature_id],
+            set_={
+                "feature_version_id": stmt.excluded.feature_version_id,
+                "computed_at": stmt.excluded.computed_at,
+            },
+            where=is_newer
         )
-        db.add(feature_value)
+        db.execute(stmt)
+    else:
+        latest = db.query(FeatureLatestVersion).filter(
+            FeatureLatestVersion.feature_id == feature_version.feature_id
+        ).with_for_update().first()
+        if latest is None:
+            db.add(FeatureLatestVersion(**values))
+        elif (values["computed_at"], values["feature_version_id"]) > (latest.computed_at, latest.feature_version_id):
+            latest.feature_version_id = values["feature_version_id"]
+            latest.computed_at = values["computed_at"]
+    
+    db.commit()
+
+
+def _json_values(feature_values: pd.Series) -> List[bytes]:
+    """
+    JSON-encode feature values exactly as serving returns them.
+    
+    Numeric values read back natively from the Parquet value store; all
+    other values (including bools) are stored as strings, which serving parses as JSON when
+    possible and otherwise returns as-is.
     
+    Args:
+        feature_values: Series with entity_id as index and feature values
+        
+    Returns:
+        JSON-encoded values aligned with the Series index
+    """
+    if (value_store is not None and isinstance(feature_values.dtype, np.dtype)
+            and feature_values.dtype.kind in 'iuf'):
+        return [orjson.dumps(value) for value in feature_values.to_numpy().tolist()]
+    
+    encoded = []
+    for value_str in _serialize_values(feature_values):
+        try:
+            orjson.loads(value_str)
+            encoded.append(value_str.encode())
+        except orjson.JSONDecodeError:
+            # Not JSON orjson accepts; encode whatever serving would decode it to
+            encoded.append(orjson.dumps(decode_value(value_str)))
+    return encoded
+
+
+def materialize_latest_values(
+    db: Session,
+    feature_version: FeatureVersion,
+    feature_name: str,
+    feature_values: pd.Series
+):
+    """
+    Write a version's values to the online store if it is the feature's latest.
+    
+    Does nothing when no online store is configured.
+    
+    Args:
+        db: Database session
+        feature_version: Newly stored feature version (after update_latest_version)
+        feature_name: Name of the feature
+        feature_values: Series with entity_id as index and feature values
+    """
+    if online_store is None:
+        return
+    
+    def is_latest() -> bool:
+        latest_version_id = db.query(FeatureLatestVersion.feature_version_id).filter(
+            FeatureLatestVersion.feature_id == feature_version.feature_id
+        ).scalar()
+        # End the read so a later check sees versions committed since
+        db.commit()
+        return latest_version_id == feature_version.id
+    
+    # Checked here to skip encoding, and again by the store under its write lock
+    # in case a newer version becomes latest in the meantime
+    if not is_latest():
+        return
+    
+    online_store.write(
+        feature_name,
+        feature_version.id,
+        _entity_id_strings(feature_values.index),
+        _json_values(feature_values),
+        is_latest
+    )
+
+
+def backfill_latest_versions(db: Session):
+    """
+    Populate latest-version entries for features that don't have one yet.
+    
+    Covers versions created before the latest-version table existed.
+    
+    Args:
+        db: Database session
+    """
+    ranked_versions = select(
+        FeatureVersion.feature_id,
+        FeatureVersion.id,
+        FeatureVersion.computed_at,
+        func.row_number().over(
+            partition_by=FeatureVersion.feature_id,
+            order_by=(FeatureVersion.computed_at.desc(), FeatureVersion.id.desc())
+        ).label("rn")
+    ).where(
+        FeatureVersion.status == "active"
+    ).subquery()
+    
+    missing = select(
+        ranked_versions.c.feature_id,
+        ranked_versions.c.id,
+        ranked_versions.c.computed_at
+    ).where(
+        ranked_versions.c.rn == 1,
+        ~exists().where(FeatureLatestVersion.feature_id == ranked_versions.c.feature_id)
+    )
+    
+    db.execute(
+        insert(FeatureLatestVersion).from_select(
+            ["feature_id", "feature_version_id", "computed_at"], missing
+        )
+    )
     db.commit()
 
 
+def records_to_dataframe(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Build a DataFrame from raw data records.
+    
+    Uses Arrow's columnar builder when pyarrow is installed. Records that Arrow
+    would load differently from pandas (differing keys, mixed-type or nested
+    columns) are loaded with pandas directly.
+    
+    Args:
+        records: List of raw data records
+        
+    Returns:
+        DataFrame with one row per record
+    """
+    if pa is not None and records:
+        keys = records[0].keys()
+        if all(record.keys() == keys for record in records):
+            try:
+                table = pa.Table.from_pylist(records)
+            except (pa.ArrowException, OverflowError):
+                table = None
+            # Arrow converts nested values to NumPy arrays rather than lists/dicts
+            if table is not None and not any(pa.types.is_nested(field.type) for field in table.schema):
+                return table.to_pandas()
+    
+    return pd.DataFrame(records)
+
+
+def arrow_stream_to_dataframe(body: bytes) -> pd.DataFrame:
+    """
+    Read an Arrow IPC stream into a DataFrame.
+    
+    Args:
+        body: Serialized Arrow IPC stream
+        
+    Returns:
+        DataFrame with the stream's record batches concatenated
+    """
+    if pa is None:
+        raise ImportError("Arrow uploads require pyarrow to be installed")
+    return pa.ipc.open_stream(body).read_all().to_pandas()
+
+
 def validate_raw_data_schema(raw_data: pd.DataFrame, schema_definition: Dict[str, Any]) -> bool:
     """
     Validate that raw data matches the schema definition.
@@ -1,5 +1,6 @@
 """Database configuration and session management."""
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -15,6 +16,37 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async drivers used for feature serving, by dialect
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def _create_async_engine(url: str):
+    """
+    Create an async engine for the same database, or None if unavailable.
+    
+    Serving falls back to the sync engine in a worker thread when the
+    dialect has no async driver or the driver isn't installed.
+    """
+    url = make_url(url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        return None
+    
+    try:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        return create_async_engine(url.set(drivername=f"{url.get_backend_name()}+{driver}"))
+    except ImportError:  # asyncpg/aiosqlite (or greenlet) not installed
+        return None
+
+
+async_engine = _create_async_engine(DATABASE_URL)
+
+if async_engine is not None:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+else:
+    AsyncSessionLocal = None
+
 
 def get_db():
     """Dependency for getting database session."""
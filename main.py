@@ -1,23 +1,37 @@
 """Main FastAPI application for the feature store."""
-from fastapi import FastAPI, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import FastAPI, Depends, HTTPException, status, Body
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional, Dict, Any, Iterable, Type
+from functools import lru_cache
+import asyncio
+import logging
 import pandas as pd
 import json
-from datetime import datetime
+import orjson
+from datetime import datetime, timezone
 
-from .database import get_db, init_db
-from .models import RawTable, Feature, FeatureVersion, FeatureValue
+from .database import get_db, init_db, SessionLocal, AsyncSessionLocal
+from .models import RawTable, Feature, FeatureVersion, FeatureValue, FeatureLatestVersion, FeatureValueFile
 from .schemas import (
     RawTableCreate, RawTableResponse,
     FeatureCreate, FeatureResponse,
     FeatureVersionCreate, FeatureVersionResponse,
     FeatureVersionCompute,
-    FeatureVectorRequest, FeatureVectorResponse
+    FeatureVectorRequest, FeatureVectorResponse,
+    construct_from_orm
+)
+from .compute import (
+    compute_feature, store_feature_values, validate_raw_data_schema,
+    validate_logic, records_to_dataframe, arrow_stream_to_dataframe,
+    update_latest_version, backfill_latest_versions, materialize_latest_values
 )
-from .compute import compute_feature, store_feature_values, validate_raw_data_schema
 from .cache import feature_cache
+from .batching import DynamicBatcher
+from .value_store import value_store, decode_value
+from .online_store import online_store
 
 app = FastAPI(
     title="Feature Store API",
@@ -25,11 +39,54 @@ app = FastAPI(
     version="1.0.0"
 )
 
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type) -> TypeAdapter:
+    """Get the (cached) serializer for a list of `schema`."""
+    return TypeAdapter(List[schema])
+
+
+def _orm_response(schema: Type, rows, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Serialize trusted ORM rows (a single row or a list) as `schema`.
+    
+    Rows were validated on write, so they are copied into the schema with
+    model_construct and dumped straight to JSON, skipping response validation.
+    """
+    if isinstance(rows, list):
+        body = _list_adapter(schema).dump_json(
+            [construct_from_orm(schema, row) for row in rows], by_alias=True
+        )
+    else:
+        body = construct_from_orm(schema, rows).model_dump_json(by_alias=True)
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup."""
+    """Initialize database (and sync the online store) on startup."""
     init_db()
+    
+    db = SessionLocal()
+    try:
+        backfill_latest_versions(db)
+        
+        if online_store is not None:
+            latest_versions = dict(
+                db.query(Feature.name, FeatureLatestVersion.feature_version_id).join(
+                    FeatureLatestVersion, FeatureLatestVersion.feature_id == Feature.id
+                ).all()
+            )
+            try:
+                online_store.sync_latest_versions(latest_versions)
+            except Exception:
+                logger.exception("Failed to sync the online store; features may be served from the database")
+    finally:
+        db.close()
 
 
 # ==================== Raw Table Endpoints ====================
@@ -60,14 +117,14 @@ def register_raw_table(raw_table: RawTableCreate, db: Session = Depends(get_db))
     db.commit()
     db.refresh(db_raw_table)
     
-    return db_raw_table
+    return _orm_response(RawTableResponse, db_raw_table, status.HTTP_201_CREATED)
 
 
 @app.get("/api/v1/raw-tables", response_model=List[RawTableResponse])
 def list_raw_tables(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """List all registered raw tables."""
     raw_tables = db.query(RawTable).offset(skip).limit(limit).all()
-    return raw_tables
+    return _orm_response(RawTableResponse, raw_tables)
 
 
 @app.get("/api/v1/raw-tables/{table_id}", response_model=RawTableResponse)
@@ -79,7 +136,7 @@ def get_raw_table(table_id: int, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Raw table with ID {table_id} not found"
         )
-    return raw_table
+    return _orm_response(RawTableResponse, raw_table)
 
 
 # ==================== Feature Endpoints ====================
@@ -102,6 +159,15 @@ def create_feature(feature: FeatureCreate, db: Session = Depends(get_db)):
             detail=f"Raw table with ID {feature.raw_table_id} not found"
         )
     
+    # Reject logic that can't run in the sandbox before it is stored
+    try:
+        validate_logic(feature.computation_logic)
+    except (SyntaxError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid computation logic: {str(e)}"
+        )
+    
     db_feature = Feature(
         name=feature.name,
         description=feature.description,
@@ -113,14 +179,14 @@ def create_feature(feature: FeatureCreate, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(db_feature)
     
-    return db_feature
+    return _orm_response(FeatureResponse, db_feature, status.HTTP_201_CREATED)
 
 
 @app.get("/api/v1/features", response_model=List[FeatureResponse])
 def list_features(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """List all feature definitions."""
     features = db.query(Feature).offset(skip).limit(limit).all()
-    return features
+    return _orm_response(FeatureResponse, features)
 
 
 @app.get("/api/v1/features/{feature_id}", response_model=FeatureResponse)
@@ -132,28 +198,18 @@ def get_feature(feature_id: int, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Feature with ID {feature_id} not found"
         )
-    return feature
+    return _orm_response(FeatureResponse, feature)
 
 
 # ==================== Feature Version Endpoints ====================
 
-@app.post("/api/v1/features/{feature_id}/versions", response_model=FeatureVersionResponse, status_code=status.HTTP_201_CREATED)
-def compute_feature_version(
-    feature_id: int,
-    request: FeatureVersionCompute,
-    db: Session = Depends(get_db)
-):
-    """
-    Compute and store a new version of a feature.
-    
-    - **feature_id**: ID of the feature (from path)
-    - **version**: Version string (e.g., 'v1.0')
-    - **data**: Array of raw data records
-    - **entity_id_column**: Column name containing entity IDs (default: 'id')
-    - **metadata**: Optional metadata about this version
-    """
-    # Validate feature exists
-    feature = db.query(Feature).filter(Feature.id == feature_id).first()
+def _get_feature_for_new_version(db: Session, feature_id: int, version: str) -> Feature:
+    """Fetch the feature a new version is computed for, rejecting duplicate versions."""
+    # Validate feature exists; its raw table's schema is needed for validation,
+    # so load it in the same query instead of lazily
+    feature = db.query(Feature).options(
+        joinedload(Feature.raw_table)
+    ).filter(Feature.id == feature_id).first()
     if not feature:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -163,30 +219,35 @@ def compute_feature_version(
     # Check if version already exists
     existing_version = db.query(FeatureVersion).filter(
         FeatureVersion.feature_id == feature_id,
-        FeatureVersion.version == request.version
+        FeatureVersion.version == version
     ).first()
     if existing_version:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Version '{request.version}' already exists for feature {feature_id}"
+            detail=f"Version '{version}' already exists for feature {feature_id}"
         )
     
-    # Convert raw data to DataFrame
-    try:
-        df = pd.DataFrame(request.data)
-        
-        if request.entity_id_column not in df.columns:
-            raise ValueError(f"Entity ID column '{request.entity_id_column}' not found in data")
-        
-        # Set entity_id as index
-        df = df.set_index(request.entity_id_column)
-        
-    except Exception as e:
+    return feature
+
+
+def _compute_and_store_version(
+    db: Session,
+    feature: Feature,
+    version: str,
+    metadata: Optional[dict],
+    df: pd.DataFrame,
+    entity_id_column: str
+) -> FeatureVersion:
+    """Index raw data by entity, compute the feature and persist the new version."""
+    if entity_id_column not in df.columns:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid raw data format: {str(e)}"
+            detail=f"Invalid raw data format: Entity ID column '{entity_id_column}' not found in data"
         )
     
+    # Set entity_id as index
+    df = df.set_index(entity_id_column)
+    
     # Validate schema
     try:
         validate_raw_data_schema(df, feature.raw_table.schema_definition)
@@ -198,7 +259,7 @@ def compute_feature_version(
     
     # Compute feature
     try:
-        feature_values = compute_feature(db, feature_id, request.version, df, feature.computation_logic)
+        feature_values = compute_feature(db, feature.id, version, df, feature.computation_logic, feature.feature_type)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -207,10 +268,10 @@ def compute_feature_version(
     
     # Create feature version
     db_version = FeatureVersion(
-        feature_id=feature_id,
-        version=request.version,
+        feature_id=feature.id,
+        version=version,
         status="active",
-        version_metadata=request.metadata
+        version_metadata=metadata
     )
     db.add(db_version)
     db.commit()
@@ -227,9 +288,100 @@ def compute_feature_version(
             detail=f"Failed to store feature values: {str(e)}"
         )
     
+    # Serve this version by default if it is the newest
+    update_latest_version(db, db_version)
+    
+    # The version is already stored and latest, so a failure here must not fail
+    # the request; readers fall back to the database for features not fully
+    # materialized, and startup drops any entry left pointing at an older version
+    try:
+        materialize_latest_values(db, db_version, feature.name, feature_values)
+    except Exception:
+        logger.exception(
+            "Failed to materialize version %s of feature '%s' to the online store", version, feature.name
+        )
+    
     return db_version
 
 
+@app.post("/api/v1/features/{feature_id}/versions", response_model=FeatureVersionResponse, status_code=status.HTTP_201_CREATED)
+def compute_feature_version(
+    feature_id: int,
+    request: FeatureVersionCompute,
+    db: Session = Depends(get_db)
+):
+    """
+    Compute and store a new version of a feature.
+    
+    - **feature_id**: ID of the feature (from path)
+    - **version**: Version string (e.g., 'v1.0')
+    - **data**: Array of raw data records
+    - **entity_id_column**: Column name containing entity IDs (default: 'id')
+    - **metadata**: Optional metadata about this version
+    """
+    feature = _get_feature_for_new_version(db, feature_id, request.version)
+    
+    # Convert raw data to DataFrame
+    try:
+        df = records_to_dataframe(request.data)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid raw data format: {str(e)}"
+        )
+    
+    db_version = _compute_and_store_version(db, feature, request.version, request.metadata, df, request.entity_id_column)
+    return _orm_response(FeatureVersionResponse, db_version, status.HTTP_201_CREATED)
+
+
+@app.post("/api/v1/features/{feature_id}/versions:arrow", response_model=FeatureVersionResponse, status_code=status.HTTP_201_CREATED)
+def compute_feature_version_arrow(
+    feature_id: int,
+    version: str,
+    entity_id_column: str = "id",
+    metadata: Optional[str] = None,
+    body: bytes = Body(..., media_type=ARROW_STREAM_MEDIA_TYPE),
+    db: Session = Depends(get_db)
+):
+    """
+    Compute and store a new version of a feature from an Arrow IPC stream.
+    
+    The request body is the raw data serialized as an Arrow IPC stream
+    (`application/vnd.apache.arrow.stream`), which skips JSON parsing entirely.
+    
+    - **feature_id**: ID of the feature (from path)
+    - **version**: Version string (e.g., 'v1.0')
+    - **entity_id_column**: Column name containing entity IDs (default: 'id')
+    - **metadata**: Optional JSON-encoded metadata about this version
+    """
+    feature = _get_feature_for_new_version(db, feature_id, version)
+    
+    try:
+        version_metadata = orjson.loads(metadata) if metadata else None
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid metadata: {str(e)}"
+        )
+    
+    # Convert Arrow stream to DataFrame
+    try:
+        df = arrow_stream_to_dataframe(body)
+    except ImportError as e:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid raw data format: {str(e)}"
+        )
+    
+    db_version = _compute_and_store_version(db, feature, version, version_metadata, df, entity_id_column)
+    return _orm_response(FeatureVersionResponse, db_version, status.HTTP_201_CREATED)
+
+
 @app.get("/api/v1/features/{feature_id}/versions", response_model=List[FeatureVersionResponse])
 def list_feature_versions(feature_id: int, db: Session = Depends(get_db)):
     """List all versions of a feature."""
@@ -241,99 +393,235 @@ def list_feature_versions(feature_id: int, db: Session = Depends(get_db)):
         )
     
     versions = db.query(FeatureVersion).filter(FeatureVersion.feature_id == feature_id).all()
-    return versions
+    return _orm_response(FeatureVersionResponse, versions)
 
 
 # ==================== Feature Vector Serving ====================
 
+def _feature_vector_query(
+    source,
+    feature_names: Optional[Iterable[str]],
+    version: Optional[str]
+):
+    """
+    Build the statement selecting (source, FeatureVersion, Feature) rows of the requested versions.
+    
+    `source` is FeatureValue for values stored in the database or
+    FeatureValueFile for values stored in the Parquet value store. The
+    statement runs on both sync and async sessions.
+    """
+    stmt = select(source, FeatureVersion, Feature).join(
+        FeatureVersion, source.feature_version_id == FeatureVersion.id
+    )
+    
+    if version:
+        # Specific version requested
+        stmt = stmt.where(FeatureVersion.version == version)
+    else:
+        # Get latest active version for each feature via the latest-version table
+        stmt = stmt.join(
+            FeatureLatestVersion, FeatureLatestVersion.feature_version_id == FeatureVersion.id
+        )
+    
+    stmt = stmt.join(Feature, FeatureVersion.feature_id == Feature.id)
+    
+    if feature_names:
+        stmt = stmt.where(Feature.name.in_(feature_names))
+    
+    return stmt
+
+
+def _group_requests(requests: List[FeatureVectorRequest]) -> Dict[tuple, set]:
+    """Group requests asking for the same features and version, collecting their entity IDs."""
+    groups: Dict[tuple, set] = {}
+    for request in requests:
+        key = (tuple(request.feature_names or ()), request.version)
+        groups.setdefault(key, set()).add(request.entity_id)
+    return groups
+
+
+def _group_vectors(
+    feature_names: tuple,
+    version: Optional[str],
+    entity_ids: set,
+    value_rows,
+    file_rows
+) -> Dict[tuple, Dict[str, Any]]:
+    """
+    Split one group's query results back out into per-entity feature vectors.
+    
+    Returns:
+        Dictionary of (feature_names, version, entity_id) to feature vector
+    """
+    vectors: Dict[tuple, Dict[str, Any]] = {}
+    for feature_value, feature_version, feature in value_rows:
+        value = decode_value(feature_value.value)
+        vector = vectors.setdefault((feature_names, version, feature_value.entity_id), {})
+        vector[feature.name] = value
+    
+    # Versions stored in Parquet: one filtered read per value file
+    for value_file, feature_version, feature in file_rows:
+        for entity_id, value in value_store.read(value_file.path, entity_ids).items():
+            vector = vectors.setdefault((feature_names, version, entity_id), {})
+            vector[feature.name] = value
+    
+    return vectors
+
+
+def _vectors_for_requests(requests: List[FeatureVectorRequest], vectors: Dict[tuple, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Look up each request's feature vector (empty if nothing was found)."""
+    return [
+        vectors.get((tuple(request.feature_names or ()), request.version, request.entity_id), {})
+        for request in requests
+    ]
+
+
+def _fetch_feature_vectors(requests: List[FeatureVectorRequest]) -> List[Dict[str, Any]]:
+    """
+    Fetch feature vectors for a batch of requests.
+    
+    Requests asking for the same features and version share a single query
+    over all their entity IDs; the rows are then split back out per entity.
+    
+    Returns:
+        Feature vector for each request, in order (empty if nothing was found)
+    """
+    vectors: Dict[tuple, Dict[str, Any]] = {}
+    db = SessionLocal()
+    try:
+        for (feature_names, version), entity_ids in _group_requests(requests).items():
+            value_rows = db.execute(
+                _feature_vector_query(FeatureValue, feature_names, version).where(
+                    FeatureValue.entity_id.in_(entity_ids)
+                )
+            ).all()
+            file_rows = []
+            if value_store is not None:
+                file_rows = db.execute(_feature_vector_query(FeatureValueFile, feature_names, version)).all()
+            
+            vectors.update(_group_vectors(feature_names, version, entity_ids, value_rows, file_rows))
+    finally:
+        db.close()
+    
+    return _vectors_for_requests(requests, vectors)
+
+
+async def _fetch_group_async(feature_names: tuple, version: Optional[str], entity_ids: set) -> Dict[tuple, Dict[str, Any]]:
+    """Fetch one request group's feature vectors on its own async session."""
+    async with AsyncSessionLocal() as db:
+        value_rows = (await db.execute(
+            _feature_vector_query(FeatureValue, feature_names, version).where(
+                FeatureValue.entity_id.in_(entity_ids)
+            )
+        )).all()
+        file_rows = []
+        if value_store is not None:
+            file_rows = (await db.execute(_feature_vector_query(FeatureValueFile, feature_names, version))).all()
+    
+    if file_rows:
+        # Parquet reads block; keep them off the event loop
+        return await asyncio.to_thread(_group_vectors, feature_names, version, entity_ids, value_rows, file_rows)
+    return _group_vectors(feature_names, version, entity_ids, value_rows, file_rows)
+
+
+async def _fetch_feature_vectors_async(requests: List[FeatureVectorRequest]) -> List[Dict[str, Any]]:
+    """
+    Fetch feature vectors for a batch of requests using the async engine.
+    
+    Same grouping as _fetch_feature_vectors, but the groups' queries run
+    concurrently instead of one after another in a worker thread.
+    
+    Returns:
+        Feature vector for each request, in order (empty if nothing was found)
+    """
+    vectors: Dict[tuple, Dict[str, Any]] = {}
+    results = await asyncio.gather(*(
+        _fetch_group_async(feature_names, version, entity_ids)
+        for (feature_names, version), entity_ids in _group_requests(requests).items()
+    ))
+    for group_vectors in results:
+        vectors.update(group_vectors)
+    
+    return _vectors_for_requests(requests, vectors)
+
+
+def _feature_vector_prefix(entity_id: str, features: bytes) -> bytes:
+    """Serialize a FeatureVectorResponse body up to the retrieved_at value, given the features JSON."""
+    return b"".join((
+        b'{"entity_id":', orjson.dumps(entity_id),
+        b',"features":', features,
+        b',"retrieved_at":"'
+    ))
+
+
+def _dump_features(feature_vector: Dict[str, Any]) -> bytes:
+    """Serialize a feature vector, with the json module for integers orjson can't encode."""
+    try:
+        return orjson.dumps(feature_vector)
+    except orjson.JSONEncodeError:
+        return json.dumps(feature_vector, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def _feature_vector_response(prefix: bytes) -> Response:
+    """Complete a serialized feature vector body with the current retrieval time."""
+    return Response(
+        content=prefix + datetime.now(timezone.utc).isoformat().encode() + b'"}',
+        media_type="application/json"
+    )
+
+
+# Coalesces concurrent cache misses into batched lookups; queries run on the
+# async engine when an async driver is installed, otherwise in worker threads
+feature_vector_batcher = DynamicBatcher(
+    _fetch_feature_vectors_async if AsyncSessionLocal is not None else _fetch_feature_vectors,
+    max_batch_size=64,
+    max_delay=0.01
+)
+
+
 @app.post("/api/v1/feature-vectors", response_model=FeatureVectorResponse)
-def get_feature_vector(request: FeatureVectorRequest, db: Session = Depends(get_db)):
+async def get_feature_vector(request: FeatureVectorRequest):
     """
     Retrieve feature vector for a given entity.
     
+    Latest-version requests are served from the online store when their
+    vector is materialized there. Other cache misses from concurrent requests
+    are batched into shared queries.
+    
     - **entity_id**: ID of the entity
     - **feature_names**: Optional list of specific features to retrieve (all if None)
     - **version**: Optional version string (latest if None)
     """
-    # Check cache first
-    cached = feature_cache.get(request.entity_id, request.feature_names, request.version)
+    # Check cache first; cached responses are serialized up to retrieved_at,
+    # so a hit only appends the timestamp
+    cached = await feature_cache.get(request.entity_id, request.feature_names, request.version)
     if cached:
-        return FeatureVectorResponse(
-            entity_id=request.entity_id,
-            features=cached,
-            retrieved_at=datetime.now()
-        )
+        return _feature_vector_response(cached)
     
-    # Build query
-    if request.version:
-        # Specific version requested
-        query = db.query(FeatureValue, FeatureVersion, Feature).join(
-            FeatureVersion, FeatureValue.feature_version_id == FeatureVersion.id
-        ).join(
-            Feature, FeatureVersion.feature_id == Feature.id
-        ).filter(
-            FeatureValue.entity_id == request.entity_id,
-            FeatureVersion.version == request.version
-        )
-        
-        if request.feature_names:
-            query = query.filter(Feature.name.in_(request.feature_names))
-        
-        results = query.all()
-    else:
-        # Get latest version for each feature
-        # First, get all features (filtered by name if specified)
-        if request.feature_names:
-            features_query = db.query(Feature).filter(Feature.name.in_(request.feature_names))
-        else:
-            features_query = db.query(Feature)
-        
-        features = features_query.all()
-        
-        # For each feature, get the latest version and its value for this entity
-        results = []
-        for feature in features:
-            # Get latest version (by computed_at timestamp)
-            latest_version = db.query(FeatureVersion).filter(
-                FeatureVersion.feature_id == feature.id,
-                FeatureVersion.status == "active"
-            ).order_by(FeatureVersion.computed_at.desc()).first()
-            
-            if latest_version:
-                # Get feature value for this entity and version
-                feature_value = db.query(FeatureValue).filter(
-                    FeatureValue.feature_version_id == latest_version.id,
-                    FeatureValue.entity_id == request.entity_id
-                ).first()
-                
-                if feature_value:
-                    results.append((feature_value, latest_version, feature))
-    
-    if not results:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"No feature vectors found for entity '{request.entity_id}'"
-        )
+    # Materialized vectors hold JSON-encoded values, spliced in without parsing
+    materialized = None
+    if online_store is not None and not request.version:
+        materialized = await online_store.read(request.entity_id, request.feature_names)
     
-    # Build feature vector
-    feature_vector = {}
-    for feature_value, feature_version, feature in results:
-        # Parse value (could be JSON)
-        try:
-            value = json.loads(feature_value.value)
-        except (json.JSONDecodeError, TypeError):
-            value = feature_value.value
+    if materialized:
+        features = b"{" + b",".join(
+            orjson.dumps(name) + b":" + value for name, value in materialized.items()
+        ) + b"}"
+    else:
+        feature_vector = await feature_vector_batcher.submit(request)
         
-        feature_vector[feature.name] = value
+        if not feature_vector:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No feature vectors found for entity '{request.entity_id}'"
+            )
+        features = _dump_features(feature_vector)
     
-    # Cache the result
-    feature_cache.set(request.entity_id, feature_vector, request.feature_names, request.version)
+    # Cache the serialized result
+    prefix = _feature_vector_prefix(request.entity_id, features)
+    await feature_cache.set(request.entity_id, prefix, request.feature_names, request.version)
     
-    return FeatureVectorResponse(
-        entity_id=request.entity_id,
-        features=feature_vector,
-        retrieved_at=datetime.now()
-    )
+    return _feature_vector_response(prefix)
 
 
 @app.get("/api/v1/health")
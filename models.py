@@ -33,7 +33,7 @@ class Feature(Base):
     feature_type = Column(String(50), nullable=False)  # 'numeric', 'categorical', 'text', etc.
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
-    # Relationships
+    # Relationships (lazy by default; raw_table is joinedload-ed when computing versions)
     raw_table = relationship("RawTable", back_populates="features")
     versions = relationship("FeatureVersion", back_populates="feature", cascade="all, delete-orphan")
     
@@ -76,6 +76,23 @@ class FeatureValue(Base):
     feature_version = relationship("FeatureVersion", back_populates="feature_values")
     
     __table_args__ = (
-        Index('idx_entity_feature', 'entity_id', 'feature_version_id'),
+        # Covering index for serving: on PostgreSQL, INCLUDE (value) allows index-only scans
+        Index('idx_entity_feature_cover', 'entity_id', 'feature_version_id', postgresql_include=['value']),
     )
 
+
+class FeatureLatestVersion(Base):
+    """Model tracking the latest active version of each feature for serving."""
+    __tablename__ = "feature_latest_versions"
+    
+    feature_id = Column(Integer, ForeignKey("features.id"), primary_key=True)
+    feature_version_id = Column(Integer, ForeignKey("feature_versions.id"), nullable=False)
+    computed_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class FeatureValueFile(Base):
+    """Model locating feature values stored in a Parquet file rather than feature_values rows."""
+    __tablename__ = "feature_value_files"
+    
+    feature_version_id = Column(Integer, ForeignKey("feature_versions.id"), primary_key=True)
+    path = Column(String(1024), nullable=False)
@@ -0,0 +1,168 @@
+"""Online store of materialized per-entity feature vectors in Redis."""
+import os
+from typing import Callable, Dict, Iterable, Optional
+
+try:
+    import redis
+    import redis.asyncio
+except ImportError:  # redis is optional; vectors are served from the database
+    redis = None
+
+# Redis URL for materialized feature vectors. When unset, every feature
+# vector is assembled from the database on read.
+ONLINE_STORE_URL = os.getenv("FEATURE_ONLINE_STORE_URL")
+
+# Entities per pipeline round trip when materializing a version
+WRITE_BATCH_SIZE = 10_000
+
+# Hash of feature name to the feature version ID currently materialized as latest
+LATEST_VERSIONS_KEY = "feature_latest_versions"
+
+# Set of every feature with a latest version, whether materialized or not
+FEATURE_NAMES_KEY = "feature_names"
+
+# Per-feature lock serializing materializations; expires if a writer stops
+# making progress for this many seconds
+WRITE_LOCK_PREFIX = "feature_write_lock:"
+WRITE_LOCK_TIMEOUT = 60
+
+
+class RedisOnlineStore:
+    """
+    Keeps the latest value of every feature for each entity in one Redis hash.
+    
+    Each entity's hash maps feature name to "<feature_version_id>:<JSON value>".
+    A separate hash records which version of each feature is latest, so values
+    left behind by older versions (e.g. entities missing from the newest one)
+    are never served. Features without an entry there (computed before the
+    store was configured, or mid-write) are served from the database.
+    """
+    
+    def __init__(self, url: str):
+        """
+        Initialize online store.
+        
+        Args:
+            url: Redis URL to materialize feature vectors in
+        """
+        if redis is None:
+            raise ImportError("FEATURE_ONLINE_STORE_URL requires the redis package to be installed")
+        # Versions are written from sync endpoints, vectors read from the async one
+        self.client = redis.Redis.from_url(url)
+        self.async_client = redis.asyncio.Redis.from_url(url)
+    
+    def _entity_key(self, entity_id: str) -> str:
+        """Get the hash key holding an entity's feature vector."""
+        return f"entity:{entity_id}"
+    
+    def write(
+        self,
+        feature_name: str,
+        feature_version_id: int,
+        entity_ids: Iterable[str],
+        values: Iterable[bytes],
+        is_latest: Callable[[], bool]
+    ) -> bool:
+        """
+        Materialize a feature version as the feature's latest values.
+        
+        Writes to a feature are serialized by a lock, and is_latest is checked
+        while holding it, so a version superseded while it waited never
+        overwrites the newer version's values or latest-version entry.
+        
+        Args:
+            feature_name: Name of the feature
+            feature_version_id: ID of the feature version
+            entity_ids: Entity ID strings aligned with values
+            values: JSON-encoded feature values
+            is_latest: Whether this version is still the feature's latest
+        
+        Returns:
+            Whether the version was materialized
+        """
+        tag = b"%d:" % feature_version_id
+        with self.client.lock(WRITE_LOCK_PREFIX + feature_name, timeout=WRITE_LOCK_TIMEOUT) as lock:
+            if not is_latest():
+                return False
+            
+            pipe = self.client.pipeline(transaction=False)
+            # Send readers to the database until every value is in place; if the
+            # write fails part way, they keep reading from there
+            pipe.sadd(FEATURE_NAMES_KEY, feature_name)
+            pipe.hdel(LATEST_VERSIONS_KEY, feature_name)
+            pipe.execute()
+            
+            for i, (entity_id, value) in enumerate(zip(entity_ids, values), 1):
+                pipe.hset(self._entity_key(entity_id), feature_name, tag + value)
+                if i % WRITE_BATCH_SIZE == 0:
+                    pipe.execute()
+                    lock.reacquire()
+            
+            pipe.hset(LATEST_VERSIONS_KEY, feature_name, feature_version_id)
+            pipe.execute()
+        return True
+    
+    def sync_latest_versions(self, latest_versions: Dict[str, int]):
+        """
+        Reconcile the store with the database's latest versions.
+        
+        Registers every feature so vectors missing it fall back to the
+        database, and drops materialized entries that are no longer latest
+        (e.g. a newer version whose materialization failed).
+        
+        Args:
+            latest_versions: Dictionary of feature name to latest feature version ID
+        """
+        if latest_versions:
+            self.client.sadd(FEATURE_NAMES_KEY, *latest_versions)
+        
+        stale = [
+            name for name, version_id in self.client.hgetall(LATEST_VERSIONS_KEY).items()
+            if latest_versions.get(name.decode()) != int(version_id)
+        ]
+        if stale:
+            self.client.hdel(LATEST_VERSIONS_KEY, *stale)
+    
+    async def read(self, entity_id: str, feature_names: Optional[Iterable[str]] = None) -> Optional[Dict[str, bytes]]:
+        """
+        Read an entity's materialized feature vector.
+        
+        Args:
+            entity_id: ID of the entity
+            feature_names: Features to return (all features if None)
+        
+        Returns:
+            Dictionary of feature name to JSON-encoded value, or None if any
+            requested feature isn't materialized and the vector must be read
+            from the database
+        """
+        try:
+            async with self.async_client.pipeline(transaction=False) as pipe:
+                pipe.hgetall(self._entity_key(entity_id))
+                pipe.hgetall(LATEST_VERSIONS_KEY)
+                if not feature_names:
+                    pipe.smembers(FEATURE_NAMES_KEY)
+                fields, latest_versions, *registered = await pipe.execute()
+        except redis.RedisError:
+            # Treat an unavailable store as a miss
+            return None
+        
+        # Every requested feature must be materialized, or the vector could
+        # silently miss features only the database has
+        required = [name.encode() for name in feature_names] if feature_names else registered[0]
+        if not required or not all(name in latest_versions for name in required):
+            return None
+        
+        # Keep only values written by each feature's latest version; entities
+        # missing from it have no value, as in the database
+        vector = {}
+        for name in required:
+            version_id, _, value = fields.get(name, b"").partition(b":")
+            if version_id == latest_versions[name]:
+                vector[name.decode()] = value
+        
+        return vector or None
+
+
+# Global online store instance; None serves every vector from the database
+online_store = RedisOnlineStore(ONLINE_STORE_URL) if ONLINE_STORE_URL else None
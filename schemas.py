@@ -1,6 +1,6 @@
 """Pydantic schemas for API request/response validation."""
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, Dict, Any, List, Type, TypeVar
 from datetime import datetime
 
 
@@ -81,6 +81,12 @@ class FeatureVectorRequest(BaseModel):
     entity_id: str = Field(..., description="ID of the entity")
     feature_names: Optional[List[str]] = Field(None, description="Specific features to retrieve (all if None)")
     version: Optional[str] = Field(None, description="Specific version to retrieve (latest if None)")
+    
+    @field_validator("feature_names")
+    @classmethod
+    def canonicalize_feature_names(cls, feature_names: Optional[List[str]]) -> Optional[List[str]]:
+        """Sort and deduplicate feature names once so they can be used directly as cache/batch keys."""
+        return sorted(set(feature_names)) if feature_names else feature_names
 
 
 class FeatureVectorResponse(BaseModel):
@@ -89,3 +95,18 @@ class FeatureVectorResponse(BaseModel):
     features: Dict[str, Any] = Field(..., description="Dictionary of feature name to value")
     retrieved_at: datetime
 
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def construct_from_orm(model: Type[ModelT], obj: Any) -> ModelT:
+    """
+    Build a schema instance from a trusted ORM object without validation.
+    
+    Attributes are read by alias, as with from_attributes, and passed to
+    model_construct. Only use for rows that were validated when written.
+    """
+    return model.model_construct(**{
+        field.alias or name: getattr(obj, field.alias or name)
+        for name, field in model.model_fields.items()
+    })
@@ -0,0 +1,104 @@
+"""Tests for feature computation logic."""
+import pandas as pd
+import pytest
+
+from .. import compute
+from ..compute import numexpr, validate_logic, _compile_logic, _compute_eval, _json_values, _entity_id_strings
+
+
+@pytest.fixture
+def raw_data():
+    return pd.DataFrame({"a": [1, 2, 3, 4], "b": [0, 1, 3, 0]}, index=["e1", "e2", "e3", "e4"])
+
+
+@pytest.mark.parametrize("logic", [
+    "df.to_csv('/tmp/x')\nresult = df['a']",
+    "df.to_json('/tmp/x')\nresult = df['a']",
+    "df.to_xml('/tmp/x')\nresult = df['a']",
+    "df.to_html('/tmp/x')\nresult = df['a']",
+    "df.to_latex('/tmp/x')\nresult = df['a']",
+    "df.to_markdown('/tmp/x')\nresult = df['a']",
+    "df.to_string(buf='/tmp/x')\nresult = df['a']",
+    "result = pd.io.common.get_handle('/etc/hostname', 'r')",
+    "result = pd.HDFStore('/tmp/x')",
+    "result = pd.ExcelWriter('/tmp/x')",
+    "result = pd.api.types.is_bool(df)",
+    "result = pd.core.common",
+    "result = pd.read_csv('/etc/hostname')",
+    "result = df.eval('a + 1')",
+    "result = '{0.__class__}'.format(df)",
+    "result = df['a'].to_numpy().tofile('/tmp/x')",
+    "result = df.apply('to_csv', path_or_buf='/tmp/x')",
+    "f = 'to_' + 'csv'\nresult = df.agg(f, '/tmp/x')",
+    "result = df.transform(*['to_json'])",
+    "result = df.agg(x=('a', 'to_csv'))",
+    "result = df['a'].pipe(pd.eval)",
+    "def g(f):\n    return df.apply(f)\nresult = g('to_csv')",
+    "x = df['a'].apply('agg', args=('to_csv',), path_or_buf='/tmp/x')\nresult = df['a']",
+    "x = df['a'].apply('apply', args=('to_pickle',), path='/tmp/x')\nresult = df['a']",
+    "x = df.agg('sum', 'to_csv')\nresult = df['a']",
+])
+def test_validate_logic_rejects_sandbox_escapes(logic):
+    with pytest.raises(ValueError):
+        validate_logic(logic)
+
+
+@pytest.mark.parametrize("logic", [
+    "result = df['a'].fillna(0).rolling(2).mean()",
+    "result = df.groupby('b')['a'].transform('mean')",
+    "result = df.apply(lambda row: row['a'] + row['b'], axis=1)",
+    "def double(x):\n    return x * 2\nresult = df['a'].apply(double)",
+    "result = pd.to_numeric(df['a']).astype('float64')",
+])
+def test_compiled_logic_runs_allowed_operations(raw_data, logic):
+    assert isinstance(_compile_logic(logic)(pd, raw_data, raw_data), pd.Series)
+
+
+@pytest.mark.skipif(numexpr is None, reason="numexpr is not installed")
+@pytest.mark.parametrize("dtype, logic, eligible", [
+    ("int64", "result = df['a'] | df['b'] > 0", True),
+    ("int64", "result = df['a'] & df['b'] == 1", True),
+    ("int64", "result = (df['a'] > 1) & (df['b'] < 2)", True),
+    ("int64", "result = ~df['a'] + 1", True),
+    ("int64", "result = df['a'] - df['b'] - 1", True),
+    ("float64", "result = -df['a'] ** 2.0", True),
+    ("float64", "result = df['a'] ** (df['b'] - 3)", True),
+    # Integer powers raise in pandas for negative exponents; numexpr truncates
+    ("int64", "result = df['a'] ** (df['b'] - 3)", False),
+    ("int64", "result = df['a'] ** 2", False),
+    # Narrow dtypes keep their width (and wrap around) in pandas
+    ("int8", "result = df['a'] * 100", False),
+    ("uint8", "result = -df['a']", False),
+    ("float32", "result = -df['a'] * 0.1", False),
+])
+def test_eval_matches_exec(raw_data, dtype, logic, eligible):
+    raw_data = raw_data.astype(dtype)
+    evaluated = _compute_eval(raw_data, logic)
+    assert (evaluated is not None) == eligible
+    if eligible:
+        pd.testing.assert_series_equal(evaluated, _compile_logic(logic)(pd, raw_data, raw_data), check_names=False)
+
+
+def test_eval_rejects_chained_comparison(raw_data):
+    assert _compute_eval(raw_data, "result = df['a'] > 1 & df['b'] < 2") is None
+
+
+@pytest.mark.parametrize("store", [None, object()])
+def test_json_values_serves_bools_as_strings(monkeypatch, store):
+    # Bools are stored as strings in either backend, so both serve "True"/"False"
+    monkeypatch.setattr(compute, "value_store", store)
+    assert _json_values(pd.Series([True, False])) == [b'"True"', b'"False"']
+
+
+@pytest.mark.parametrize("index", [
+    pd.Index([1, 2, 3]),
+    pd.Index([1.5, 2.0]),
+    pd.Index([1.0, None]),
+    pd.Index(["e1", None], dtype=object),
+    pd.Index(["e1", None], dtype="string"),
+    pd.Index([1, None], dtype="Int64"),
+    pd.DatetimeIndex(["2024-01-01", None]),
+    pd.MultiIndex.from_tuples([("a", 1), ("b", 2)]),
+])
+def test_entity_id_strings_match_str(index):
+    assert list(_entity_id_strings(index)) == [str(entity_id) for entity_id in index]
@@ -0,0 +1,58 @@
+"""Tests for reading materialized feature vectors."""
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from ..online_store import RedisOnlineStore
+
+
+@pytest.fixture
+def store():
+    store = RedisOnlineStore.__new__(RedisOnlineStore)
+    server = fakeredis.FakeServer()
+    store.client = fakeredis.FakeRedis(server=server)
+    store.async_client = fakeredis.FakeAsyncRedis(server=server)
+    return store
+
+
+def read(store, entity_id, feature_names=None):
+    return asyncio.run(store.read(entity_id, feature_names))
+
+
+def test_read_all_features_requires_every_feature_materialized(store):
+    # 'old' was computed before the online store was configured
+    store.sync_latest_versions({"old": 1})
+    store.write("new", 2, ["e1"], [b"2"], lambda: True)
+    
+    assert read(store, "e1") is None
+    assert read(store, "e1", ["new"]) == {"new": b"2"}
+    
+    store.write("old", 3, ["e1"], [b"1"], lambda: True)
+    assert read(store, "e1") == {"old": b"1", "new": b"2"}
+
+
+def test_read_skips_entities_missing_from_latest_version(store):
+    store.write("a", 1, ["e1", "e2"], [b"1", b"2"], lambda: True)
+    store.write("a", 2, ["e1"], [b"3"], lambda: True)
+    store.write("b", 3, ["e2"], [b"4"], lambda: True)
+    
+    assert read(store, "e1") == {"a": b"3"}
+    assert read(store, "e2") == {"b": b"4"}
+
+
+def test_sync_drops_entries_that_are_no_longer_latest(store):
+    store.write("a", 1, ["e1"], [b"1"], lambda: True)
+    # Version 2 became latest but was never materialized
+    store.sync_latest_versions({"a": 2})
+    
+    assert read(store, "e1") is None
+
+
+def test_write_skips_version_superseded_before_taking_lock(store):
+    # Version 1 passed its first check, then version 2 became latest and was materialized
+    store.write("a", 2, ["e1"], [b"2"], lambda: True)
+    
+    assert not store.write("a", 1, ["e1"], [b"1"], lambda: False)
+    assert read(store, "e1") == {"a": b"2"}
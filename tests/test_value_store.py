@@ -0,0 +1,24 @@
+"""Tests for decoding stored feature values."""
+import math
+
+import pytest
+
+from ..value_store import decode_value
+
+
+@pytest.mark.parametrize("stored, expected", [
+    ("1.5", 1.5),
+    ('{"a": [1, 2]}', {"a": [1, 2]}),
+    ("123456789012345678901234567890", 123456789012345678901234567890),
+    ("[1, 123456789012345678901234567890]", [1, 123456789012345678901234567890]),
+    ("True", "True"),
+    ("hello", "hello"),
+    (None, None),
+])
+def test_decode_value(stored, expected):
+    assert decode_value(stored) == expected
+
+
+def test_decode_value_reads_nan_written_by_json_dumps():
+    value = decode_value("[1.0, NaN]")
+    assert value[0] == 1.0 and math.isnan(value[1])
@@ -0,0 +1,114 @@
+"""Columnar storage of feature values in Parquet files."""
+import os
+import re
+import json
+import orjson
+from typing import Any, Dict, Iterable
+import pandas as pd
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.fs
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; values are stored in the database
+    pa = None
+
+# Location for Parquet value files (local directory or URI such as s3://bucket/prefix).
+# When unset, feature values are stored as rows in the database.
+VALUE_STORE_URI = os.getenv("FEATURE_VALUE_STORE_URI")
+
+# Digit runs too long for a 64-bit integer, which orjson parses as floats
+_LONG_DIGITS = re.compile(r"\d{20}")
+
+
+class ParquetValueStore:
+    """Stores each feature version's values as one Parquet file sorted by entity_id."""
+    
+    def __init__(self, uri: str):
+        """
+        Initialize value store.
+        
+        Args:
+            uri: Local directory or filesystem URI to write value files under
+        """
+        if pa is None:
+            raise ImportError("FEATURE_VALUE_STORE_URI requires pyarrow to be installed")
+        if "://" not in uri:
+            uri = os.path.abspath(uri)
+        self.filesystem, self.root = pa.fs.FileSystem.from_uri(uri)
+    
+    def write(self, feature_version_id: int, entity_ids: np.ndarray, feature_values: pd.Series) -> str:
+        """
+        Write a feature version's values.
+        
+        Args:
+            feature_version_id: ID of the feature version
+            entity_ids: Entity ID strings aligned with feature_values
+            feature_values: Series of values; numeric values are stored
+                natively, anything else (including bools) as pre-serialized
+                strings, so bools are served as "True"/"False" like database rows
+        
+        Returns:
+            Path of the written file
+        """
+        table = pa.table({
+            "entity_id": pa.array(entity_ids, pa.string()),
+            "value": pa.array(feature_values.to_numpy(), from_pandas=True),
+        }).sort_by("entity_id")
+        
+        path = f"{self.root}/feature_version_id={feature_version_id}.parquet"
+        self.filesystem.create_dir(self.root, recursive=True)
+        pq.write_table(table, path, filesystem=self.filesystem)
+        return path
+    
+    def read(self, path: str, entity_ids: Iterable[str]) -> Dict[str, Any]:
+        """
+        Read values for the given entities from a value file.
+        
+        Args:
+            path: Path returned by write
+            entity_ids: Entity IDs to read
+        
+        Returns:
+            Dictionary of entity_id to value
+        """
+        table = pq.read_table(
+            path,
+            filesystem=self.filesystem,
+            filters=[("entity_id", "in", list(entity_ids))]
+        )
+        values = table.column("value").to_pylist()
+        
+        # String columns hold serialized values (could be JSON)
+        if pa.types.is_string(table.schema.field("value").type):
+            values = [decode_value(value) for value in values]
+        
+        return dict(zip(table.column("entity_id").to_pylist(), values))
+
+
+def decode_value(value: str) -> Any:
+    """
+    Parse a serialized value (could be JSON), falling back to the raw string.
+    
+    Parses with orjson, except for text it reads differently from the json
+    module: integers beyond 64 bits, and NaN/Infinity in values stored by
+    json.dumps before values were encoded with orjson.
+    """
+    try:
+        if _LONG_DIGITS.search(value) is None:
+            return orjson.loads(value)
+    except TypeError:
+        return value
+    except orjson.JSONDecodeError:
+        if "NaN" not in value and "Infinity" not in value:
+            return value
+    
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+# Global value store instance; None keeps values in the database
+value_store = ParquetValueStore(VALUE_STORE_URI) if VALUE_STORE_URI else None